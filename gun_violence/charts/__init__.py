@@ -1,19 +1,112 @@
 from phila_style.matplotlib import get_theme
 from phila_style import *
+import importlib
+import matplotlib
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor
 
 palette = get_default_palette()
 digital_standards = get_digital_standards()
 default_style = get_theme()
 light_palette = get_light_palette()
 
+# The chart modules, each providing a plot(fig_num, outfile) function
+# NOTE: these are imported on first access, since loading them pulls in
+# the datasets, pandas, geopandas, and seaborn
+_CHARTS = [
+    "price_vs_homicides_by_hood",
+    "homicide_trends",
+    "homicides_by_hood",
+    "prices_near_homicides",
+    "population_change",
+    "homicides_poverty",
+    "cost_benefit",
+    "added_revenue",
+    "lives_saved",
+    "pta",
+]
 
-from .price_vs_homicides_by_hood import plot as price_vs_homicides_by_hood
-from .homicide_trends import plot as homicide_trends
-from .homicides_by_hood import plot as homicides_by_hood
-from .prices_near_homicides import plot as prices_near_homicides
-from .population_change import plot as population_change
-from .homicides_poverty import plot as homicides_poverty
-from .cost_benefit import plot as cost_benefit
-from .added_revenue import plot as added_revenue
-from .lives_saved import plot as lives_saved
-from .pta import plot as pta
+__all__ = _CHARTS + ["plot_all"]
+
+
+class _ChartsModule(types.ModuleType):
+    """
+    The charts package, which resolves each chart name to its plot function.
+
+    Notes
+    -----
+    Importing a submodule binds the module object to its name on this
+    package (e.g., ``from gun_violence.charts.cost_benefit import ...``),
+    so the chart names are looked up here rather than in the namespace.
+    """
+
+    def __getattribute__(self, name):
+        if name in _CHARTS:
+            return importlib.import_module(f".{name}", __name__).plot
+        return super().__getattribute__(name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_CHARTS))
+
+
+sys.modules[__name__].__class__ = _ChartsModule
+
+
+def _render(name, fig_num, outfile):
+    """
+    Import the chart module by name, save the figure, and return the list
+    of files written.
+    """
+    # NOTE: workers only write files, so use the non-interactive backend
+    matplotlib.use("Agg")
+    from matplotlib import pyplot as plt
+
+    module = importlib.import_module(f".{name}", __name__)
+    module.plot(fig_num, outfile)
+
+    # Free the saved figures, since the worker may render more charts
+    plt.close("all")
+
+    # NOTE: some charts save several figures, named after the output file
+    if hasattr(module, "get_outfiles"):
+        return module.get_outfiles(outfile)
+    return [outfile]
+
+
+def plot_all(figures, max_workers=None):
+    """
+    Render several charts in parallel, one chart per worker process.
+
+    Parameters
+    ----------
+    figures : list of tuple
+        the (chart name, figure number, output file) for each chart,
+        e.g., ``[("cost_benefit", 1, "cost_benefit.png")]``
+    max_workers : int, optional
+        the number of worker processes; defaults to the number of CPUs
+
+    Returns
+    -------
+    outfiles : list of str
+        the files written, in the order of ``figures``; charts that save
+        several figures (e.g., ``price_vs_homicides_by_hood``) add one file
+        per figure
+
+    Notes
+    -----
+    Charts are passed to the workers by name, so each worker only imports
+    the chart modules it needs (and builds its own default style).
+    """
+    for name, _, _ in figures:
+        if name not in _CHARTS:
+            raise ValueError(f"Unknown chart '{name}'; choose from {_CHARTS}")
+
+    if not figures:
+        return []
+
+    names, fig_nums, outfiles = zip(*figures)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        written = executor.map(_render, names, fig_nums, outfiles)
+        return [f for files in written for f in files]
@@ -7,8 +7,7 @@ from . import default_style, palette, digital_standards
 import numpy as np
 import pandas as pd
 from matplotlib import pyplot as plt
-import seaborn as sns
-from .cost_benefit import simulate_violence_reduction_plan
+from .cost_benefit import simulate_violence_reduction_plan, _WHITE_BBOX
 
 
 def plot(fig_num, outfile):
@@ -31,20 +30,19 @@ def plot(fig_num, outfile):
 
         # Top panel: cumulative added revenue
         color = digital_standards["dark-ben-franklin"]
-        sns.barplot(
-            x=data["plan_year"],
-            y=data["compounded_revenue"] / 1e6,
-            color=color,
-            ax=ax,
-            saturation=1.0,
-            zorder=100,
-        )
+        x = np.arange(len(data))
+        ax.bar(x, data["compounded_revenue"].values / 1e6, 0.8, color=color, zorder=100)
+        ax.set_xticks(x)
+        ax.set_xticklabels(data["plan_year"].values)
+        ax.set_xlim(-0.5, len(data) - 0.5)
+        ax.xaxis.grid(False)
 
         # Format y-axis
         ax.set_ylabel("")
         ax.set_ylim(0, 55)
-        ax.set_yticks([0, 10, 20, 30, 40, 50])
-        ax.set_yticklabels(["$%.0fM" % x for x in ax.get_yticks()], fontsize=11)
+        yticks = [0, 10, 20, 30, 40, 50]
+        ax.set_yticks(yticks)
+        ax.set_yticklabels(["$%.0fM" % x for x in yticks], fontsize=11)
 
         # Format x-axis
         ax.set_xlabel("Plan Year", fontsize=10, weight="bold")
@@ -55,16 +53,18 @@ def plot(fig_num, outfile):
         ax.axhline(y=0, c=palette["light-gray"], lw=4, zorder=101)
 
         # Add numbers above the bars
-        for i, row in data.iterrows():
+        revenue = data["compounded_revenue"].values / 1e6
+        labels = ["$%.0fM" % value for value in revenue]
+        for i, (value, label) in enumerate(zip(revenue, labels)):
             ax.text(
                 i,
-                row["compounded_revenue"] / 1e6,
-                "$%.0fM" % (row["compounded_revenue"] / 1e6),
+                value,
+                label,
                 va="bottom",
                 ha="center",
                 weight="bold",
                 fontsize=10,
-                bbox=dict(facecolor="white", pad=0),
+                bbox=_WHITE_BBOX,
             )
 
         # Add title
@@ -107,5 +107,5 @@ def plot(fig_num, outfile):
         )
 
         # Save!
-        plt.savefig(outfile, dpi=300)
+        fig.savefig(outfile, dpi=300)
 
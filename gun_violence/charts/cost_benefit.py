@@ -12,10 +12,81 @@ from . import default_style, palette, light_palette, digital_standards
 import numpy as np
 import pandas as pd
 from matplotlib import pyplot as plt
-import seaborn as sns
+from functools import lru_cache
 
+# White background for the bar labels
+_WHITE_BBOX = dict(facecolor="white", pad=0)
 
-def simulate_violence_reduction_plan():
+# Colors for the annual cost and revenue bars
+_COSTS_COLORS = [
+    digital_standards["love-park-red"],
+    digital_standards["dark-ben-franklin"],
+]
+
+
+def _format_currency(y):
+    """
+    Format a value in millions of dollars with an explicit sign.
+    """
+    if y < 0:
+        fmt = "\u2212" + "$%.0fM"
+    else:
+        fmt = "+$%.0fM"
+    return fmt % (abs(y))
+
+
+@lru_cache(maxsize=16)
+def _simulate_violence_reduction_plan(
+    num_years, start_year, initial_homicides, cost_per_homicide, total_revenue
+):
+    """
+    Internal function to run the simulation, returning a dict of arrays.
+
+    The result is cached, so the arrays are marked read-only.
+    """
+    # Calculte the number of lives saved
+    # NOTE: use the builtin round() on scalars to avoid the ufunc overhead;
+    # like np.round(), it rounds halves to even
+    homicides = [initial_homicides]
+    for i in range(1, num_years):
+        homicides.append(homicides[i - 1] - round(homicides[i - 1] * 0.1))
+    homicides = np.array(homicides)
+
+    # Annual changes, costs, and revenue
+    homicide_change = np.abs(np.diff(homicides, prepend=homicides[0]))
+    plan_cost = homicides * cost_per_homicide
+    added_tax_revenue = homicide_change / homicides[0] * total_revenue
+
+    # Add cumulative revenue
+    # NOTE: added revenue is zero in the first year, so the running sum
+    # matches the original zero-prefixed compounding
+    compounded_revenue = np.cumsum(added_tax_revenue)
+
+    out = {
+        "year": np.arange(start_year, start_year + num_years),
+        "homicides": homicides,
+        "homicide_change": homicide_change,
+        "lives_saved": homicides[0] - homicides,
+        "plan_cost": plan_cost,
+        "added_tax_revenue": added_tax_revenue,
+        "cumulative_cost": np.cumsum(plan_cost),
+        "plan_year": np.arange(1, num_years + 1),
+        "compounded_revenue": compounded_revenue,
+        "cumulative_revenue": np.cumsum(compounded_revenue),
+    }
+    for values in out.values():
+        values.setflags(write=False)
+
+    return out
+
+
+def simulate_violence_reduction_plan(
+    num_years=5,
+    start_year=2018,
+    initial_homicides=351,
+    cost_per_homicide=30e3,
+    total_revenue=125.7e6,
+):
     """
     Simulate the violence reduction plan over five years, assuming 
     a 10% annual reduction in homicides. This calculates:
@@ -23,43 +94,32 @@ def simulate_violence_reduction_plan():
     1. The number of lives saved.
     2. The annual plan costs, assuming a funding level of $30K per homicide.
     3. The added tax revenue from property tax revenues.
-    """
-    NUM_YEARS = 5  # Run analysis for 5 years
-    START_YEAR = 2018  # First year of plan
-    COST_PER_HOMICIDE = 30e3  # Per Thomas Abt's estimate in Bleeding Out
-    TOTAL_REVENUE = 125.7e6  # From analysis of property assessments near homicides
 
-    # Calculte the number of lives saved
-    homicides = [351]
-    for i in range(1, NUM_YEARS):
-        homicides.append(homicides[i - 1] - np.round(homicides[i - 1] * 0.1))
-
-    # Make into a DataFrame
-    df = pd.DataFrame(
-        {
-            "year": list(range(START_YEAR, START_YEAR + NUM_YEARS)),
-            "homicides": homicides,
-        }
-    ).assign(
-        homicide_change=lambda df: abs(df["homicides"].diff()).fillna(0),
-        lives_saved=lambda df: homicides[0] - df["homicides"],
-        plan_cost=lambda df: df["homicides"] * COST_PER_HOMICIDE,
-        added_tax_revenue=lambda df: df["homicide_change"]
-        / homicides[0]
-        * TOTAL_REVENUE,
-        cumulative_cost=lambda df: df["plan_cost"].cumsum(),
-        plan_year=lambda df: range(1, len(df) + 1),
+    Parameters
+    ----------
+    num_years : int, optional
+        the number of years to run the plan for
+    start_year : int, optional
+        the first year of the plan
+    initial_homicides : int, optional
+        the number of homicides in the first year of the plan
+    cost_per_homicide : float, optional
+        the annual plan cost per homicide, per Thomas Abt's estimate 
+        in Bleeding Out
+    total_revenue : float, optional
+        the added property tax revenue if all homicides were eliminated, 
+        from the analysis of property assessments near homicides
+
+    Notes
+    -----
+    The simulation only runs once per set of parameters; a new DataFrame
+    holding a copy of the cached result is returned so it can be safely 
+    modified.
+    """
+    result = _simulate_violence_reduction_plan(
+        num_years, start_year, initial_homicides, cost_per_homicide, total_revenue
     )
-
-    # Add cumulative revenue
-    R = [0]
-    for i in range(1, NUM_YEARS):
-        r = df.iloc[: i + 1]["added_tax_revenue"].sum()
-        R.append(r)
-    df["compounded_revenue"] = R
-    df["cumulative_revenue"] = df["compounded_revenue"].cumsum()
-
-    return df
+    return pd.DataFrame(result, copy=True)
 
 
 def _plot_net_gain(ax, data):
@@ -83,30 +143,22 @@ def _plot_net_gain(ax, data):
         label="Cumulative Return on Investment",
     )
 
-    def format_currency(y):
-        if y < 0:
-            fmt = "\u2212" + "$%.0fM"
-        else:
-            fmt = "+$%.0fM"
-        return fmt % (abs(y))
-
     # Add the dollar amounts
-    for i in range(len(net_gain)):
-        yval = net_gain.iloc[i]
-        if yval < 0:
-            yval -= 5
+    for i, value in enumerate(net_gain.values):
+        if value < 0:
+            yval = value - 5
         else:
-            yval += 7
+            yval = value + 7
         ax.text(
             i + 0.1 + 1,
             yval,
-            format_currency(net_gain.iloc[i]),
+            _format_currency(value),
             ha="left" if yval < 0 else "right",
             va="top" if yval < 0 else "bottom",
             fontsize=9,
             weight="bold",
             zorder=102,
-            bbox=dict(facecolor="white", pad=0),
+            bbox=_WHITE_BBOX,
         )
 
     # Add a y=0 line
@@ -122,8 +174,9 @@ def _plot_net_gain(ax, data):
     # Format the y-axis
     ax.set_ylabel("")
     ax.set_ylim(-30)
-    ax.set_yticks([0, 40, 80])
-    ax.set_yticklabels([format_currency(x) for x in ax.get_yticks()], fontsize=11)
+    yticks = [0, 40, 80]
+    ax.set_yticks(yticks)
+    ax.set_yticklabels([_format_currency(x) for x in yticks], fontsize=11)
     plt.setp(ax.get_yticklabels(), ha="center")
 
     # Add a legend
@@ -141,25 +194,30 @@ def _plot_annual_costs(ax, data):
     """
     Plot a grouped bar chart showing the annual cost/revenue numbers.
     """
-    # Plot
-    sns.barplot(
-        x="plan_year",
-        y="value",
-        hue="variable",
-        palette=[
-            digital_standards[color] for color in ["love-park-red", "dark-ben-franklin"]
-        ],
-        ax=ax,
-        saturation=1.0,
-        zorder=100,
-        data=data,
-    )
+    # Plot the costs and revenue side by side for each year
+    columns = {
+        "plan_cost": "Annual Costs",
+        "compounded_revenue": "Revenue Added Each Year",
+    }
+    x = np.arange(len(data))
+    width = 0.4
+    for i, col in enumerate(columns):
+        ax.bar(
+            x + (i - 0.5) * width,
+            data[col].values / 1e6,
+            width,
+            color=_COSTS_COLORS[i],
+            label=columns[col],
+            zorder=100,
+        )
 
     # Add a y=0 line
     ax.axhline(y=0, c=palette["light-gray"], lw=4, zorder=101)
 
     # Format the x-axis
-    ax.set_xlim(left=-0.75)
+    ax.set_xticks(x)
+    ax.set_xticklabels(data["plan_year"].values)
+    ax.set_xlim(-0.75, len(data) - 0.5)
     plt.setp(ax.get_xticklabels(), fontsize=11)
     ax.set_xlabel("Plan Year", fontsize=10, weight="bold")
     ax.xaxis.labelpad = 0
@@ -183,20 +241,18 @@ def _plot_annual_costs(ax, data):
     )
 
     # Add the total dollar amount above the bars
-    for p in ax.patches:
-        height = p.get_height()
-        if height == 0:
-            y = 3
-        else:
-            y = height + 2
+    heights = np.array([p.get_height() for p in ax.patches])
+    labels = ["$%.0fM" % height for height in heights]
+    yvals = np.where(heights == 0, 3, heights + 2)
+    for p, label, y in zip(ax.patches, labels, yvals):
         ax.text(
             p.get_x() + p.get_width() / 2.0,
             y,
-            "$%.0fM" % height,
+            label,
             ha="center",
             fontsize=8,
             va="center",
-            bbox=dict(facecolor="white", pad=0),
+            bbox=_WHITE_BBOX,
         )
 
 
@@ -213,22 +269,6 @@ def plot(fig_num, outfile):
     # Perform the calculation
     data = simulate_violence_reduction_plan()
 
-    # Melt the data into the right format
-    melted = (
-        data[["plan_year", "plan_cost", "compounded_revenue"]]
-        .assign(
-            plan_cost=lambda df: df.plan_cost / 1e6,
-            compounded_revenue=lambda df: df.compounded_revenue / 1e6,
-        )
-        .rename(
-            columns={
-                "plan_cost": "Annual Costs",
-                "compounded_revenue": "Revenue Added Each Year",
-            }
-        )
-        .melt(id_vars=["plan_year"])
-    )
-
     # Plot
     with plt.style.context(default_style):
 
@@ -248,7 +288,7 @@ def plot(fig_num, outfile):
         )
 
         # Make the plots
-        _plot_annual_costs(axs[0], melted)
+        _plot_annual_costs(axs[0], data)
         _plot_net_gain(axs[1], data)
 
         # Add a figure title
@@ -297,5 +337,4 @@ def plot(fig_num, outfile):
         )
 
         # Save!
-        plt.savefig(outfile, dpi=300)
-
+        fig.savefig(outfile, dpi=300)
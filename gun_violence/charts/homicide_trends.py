@@ -8,6 +8,7 @@ A 4x4 panel chart showing the following trends in homicides in Philadelphia:
 """
 from .. import datasets as gv_data
 from . import default_style, palette
+import numpy as np
 import pandas as pd
 from matplotlib import pyplot as plt
 import seaborn as sns
@@ -46,23 +47,65 @@ def _age_panel(ax, df):
     )
 
 
-def _gender_panel(ax, df):
+def _count_by_year(years, index, values):
     """
-    Stacked bar graph showing the homicide victims by gender.
+    Count the homicides per year for each category of ``values``.
+
+    Parameters
+    ----------
+    years : array_like
+        the unique years
+    index : array_like
+        the index into ``years`` for each homicide
+    values : pandas.Series
+        the category (e.g., gender) for each homicide
+
+    Returns
+    -------
+    DataFrame :
+        the counts, with the years as the index and the categories as columns
+    """
+    values = values.astype("category")
+    codes = values.cat.codes.values
+
+    # Accumulate the counts, skipping missing values (code of -1)
+    valid = codes >= 0
+    N = np.zeros((len(years), len(values.cat.categories)), dtype=int)
+    np.add.at(N, (index[valid], codes[valid]), 1)
+
+    return pd.DataFrame(N, index=years, columns=values.cat.categories)
+
+
+def _stacked_bars(ax, N, order, colors):
     """
-    # Get the data by year and gender
-    N = df.groupby(["year", "sex"]).size().reset_index(name="N")
+    Plot a stacked bar graph with one bar per year (the index of ``N``),
+    stacking the columns of ``N`` in the specified order.
+    """
+    x = np.arange(len(N))
+    bottom = np.zeros(len(N))
+    for col, color in zip(order, colors):
+        values = N[col].values
+        ax.bar(x, values, 0.5, bottom=bottom, color=palette[color], label=col)
+        bottom += values
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(N.index)
+    ax.set_xlim(-0.5, len(N) - 0.5)
+
+
+def _gender_panel(ax, N):
+    """
+    Stacked bar graph showing the homicide victims by gender.
 
+    ``N`` holds the number of homicides by year (index) and gender (columns).
+    """
     # Plot a stacked bar graph
     colors = ["blue", "red"]
     order = ["Male", "Female"]
-    N.pivot(index="year", columns="sex", values="N").fillna(0)[order].plot.bar(
-        stacked=True, ax=ax, legend=False, color=[palette[c] for c in colors]
-    )
+    _stacked_bars(ax, N, order, colors)
 
     # Format the x-axis
     plt.setp(ax.get_xticklabels(), rotation=90, fontsize=11)
-    ax.set_xlabel("")
 
     # Add a legend
     ax.legend(
@@ -96,12 +139,11 @@ def _gender_panel(ax, df):
     )
 
 
-def _weapon_panel(ax, df):
+def _weapon_panel(ax, N_all, N_firearm):
     """
     Plot the annual homicide total for all homicides and firearms only.
     """
     # Plot the total per year
-    N_all = df.groupby("year").size()
     color = palette["blue"]
     ax.plot(
         N_all.index.tolist(),
@@ -117,7 +159,6 @@ def _weapon_panel(ax, df):
     )
 
     # Plot only the firearm-involved
-    N_firearm = df.query("weapon == 'firearm'").groupby("year").size()
     color = palette["red"]
     ax.plot(
         N_firearm.index.tolist(),
@@ -152,7 +193,7 @@ def _weapon_panel(ax, df):
             )
 
     # Format the x-axis
-    ax.set_xticks(sorted(df["year"].unique()))
+    ax.set_xticks(N_all.index.tolist())
     plt.setp(ax.get_xticklabels(), rotation=90, fontsize=11)
 
     # Format the y-axis
@@ -187,26 +228,19 @@ def _weapon_panel(ax, df):
     ax.axhline(y=0, c="k", lw=1, clip_on=False, zorder=10)
 
 
-def _race_panel(ax, df):
+def _race_panel(ax, N):
     """
     Stacked bar graph showing breakdown of homicide by race: Black, White, and All Others
-    """
-    df["race"] = df["race"].replace({"Black": "Black/African American"})
-
-    # Do Black/White/Other
-    df.loc[~df.race.isin(["Black/African American", "White"]), "race"] = "All Others"
-    N = df.groupby(["year", "race"]).size().reset_index(name="N")
 
+    ``N`` holds the number of homicides by year (index) and race (columns).
+    """
     # Plot
     colors = ["blue", "yellow", "red"]
     order = ["Black/African American", "White", "All Others"]
-    N.pivot(index="year", columns="race", values="N").fillna(0)[order].plot.bar(
-        stacked=True, ax=ax, legend=False, color=[palette[c] for c in colors]
-    )
+    _stacked_bars(ax, N, order, colors)
 
     # Format the x-axis
     plt.setp(ax.get_xticklabels(), rotation=90, fontsize=11)
-    ax.set_xlabel("")
 
     # Format the y-axis
     plt.setp(ax.get_yticklabels(), fontsize=11)
@@ -259,6 +293,25 @@ def plot(fig_num, outfile):
     # Load the data
     homicides = gv_data.PoliceHomicides.get()
 
+    # Do Black/White/Other
+    # NOTE: race is categorical, so recode plain object values
+    race = homicides["race"].astype(object).replace({"Black": "Black/African American"})
+    race = race.where(race.isin(["Black/African American", "White"]), "All Others")
+
+    # Index each homicide by year
+    years, index = np.unique(homicides["year"].values, return_inverse=True)
+
+    # Count the total and firearm-involved homicides per year
+    is_firearm = (homicides["weapon"] == "firearm").values
+    N_all = pd.Series(np.bincount(index), index=years)
+    N_firearm = pd.Series(
+        np.bincount(index[is_firearm], minlength=len(years)), index=years
+    )
+
+    # Count the homicides per year by gender and race
+    N_sex = _count_by_year(years, index, homicides["sex"])
+    N_race = _count_by_year(years, index, race)
+
     with plt.style.context(default_style):
 
         # Create the figure
@@ -272,9 +325,9 @@ def plot(fig_num, outfile):
         )
 
         # Make each plot
-        _weapon_panel(axs[0, 0], homicides)
-        _race_panel(axs[0, 1], homicides)
-        _gender_panel(axs[1, 0], homicides)
+        _weapon_panel(axs[0, 0], N_all, N_firearm)
+        _race_panel(axs[0, 1], N_race)
+        _gender_panel(axs[1, 0], N_sex)
         _age_panel(axs[1, 1], homicides)
 
         # Add the footnote
@@ -318,5 +371,4 @@ def plot(fig_num, outfile):
             style="italic",
         )
 
-        plt.savefig(outfile, dpi=300)
-
+        fig.savefig(outfile, dpi=300)
@@ -11,6 +11,17 @@ import numpy as np
 from matplotlib import pyplot as plt
 import seaborn as sns
 from mpl_toolkits.axes_grid1.axes_divider import make_axes_locatable
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4)
+def _buffered_limits(pad):
+    """
+    Return the city limits buffered by ``pad`` feet.
+
+    The result is cached, since it is the same for each panel.
+    """
+    return gv_data.CityLimits.get().buffer(pad)
 
 
 def _plot_choropleth(
@@ -28,9 +39,12 @@ def _plot_choropleth(
     fig.add_axes(cax, label="cax")
 
     # Plot the city limits as background
-    limits = gv_data.CityLimits.get()
-    limits.buffer(1500).plot(
-        ax=ax, facecolor=palette["sidewalk"], edgecolor=palette["sidewalk"]
+    # NOTE: the polygons are rasterized to keep vector output (PDF/SVG) small
+    _buffered_limits(1500).plot(
+        ax=ax,
+        facecolor=palette["sidewalk"],
+        edgecolor=palette["sidewalk"],
+        rasterized=True,
     )
 
     # Plot the choropleth
@@ -44,6 +58,7 @@ def _plot_choropleth(
         vmin=ticks[0],
         vmax=ticks[-1],
         zorder=10,
+        rasterized=True,
     )
 
     # Set axes limits
@@ -53,7 +68,11 @@ def _plot_choropleth(
     ax.set_ylim(ymin - PAD, ymax + PAD)
 
     # Format the colorbar
-    cbar = plt.colorbar(ax.collections[-1], cax=cax, orientation="horizontal")
+    # NOTE: use the same color mapping as the choropleth, rather than
+    # looking up the choropleth's collection on the axes
+    sm = plt.cm.ScalarMappable(cmap=cmap, norm=plt.Normalize(ticks[0], ticks[-1]))
+    sm.set_array([])
+    cbar = plt.colorbar(sm, cax=cax, orientation="horizontal")
     cbar.set_ticks(ticks)
 
     # Format axes
@@ -65,7 +84,8 @@ def _plot_choropleth(
 
     # Format prices
     if format_prices:
-        cbar.set_ticklabels(["$%.0fK" % (np.exp(x) / 1e3) for x in ticks])
+        prices = np.exp(ticks) / 1e3
+        cbar.set_ticklabels(["$%.0fK" % price for price in prices])
 
     return cbar
 
@@ -82,6 +102,22 @@ def plot(fig_num, outfile):
     neighborhoods = gv_data.Neighborhoods.get()
     sales = gv_data.ResidentialSales.get()
 
+    # Only use 2018 homicides and sales
+    homicides = homicides.loc[homicides["year"].values == 2018]
+    sales = sales.loc[sales["sale_year"].values == 2018]
+
+    # Total homicides and median sale price by neighborhood
+    N_homicides = (
+        homicides.groupby("neighborhood", observed=True, sort=False)
+        .size()
+        .reset_index(name="N")
+    )
+    median_prices = (
+        sales.groupby("neighborhood", observed=True, sort=False)["ln_sale_price"]
+        .median()
+        .reset_index(name="N")
+    )
+
     with plt.style.context(default_style):
 
         # Create the figure
@@ -99,18 +135,11 @@ def plot(fig_num, outfile):
         _plot_choropleth(
             fig,
             ax,
-            pd.merge(
-                neighborhoods,
-                homicides.query("year == 2018")
-                .groupby("neighborhood")
-                .size()
-                .reset_index(name="N"),
-                how="left",
-            ).fillna(0),
+            pd.merge(neighborhoods, N_homicides, how="left").fillna(0),
             ticks=[0, 10, 20],
         )
 
-        total = len(homicides.query("year == 2018"))
+        total = len(homicides)
         ax.text(
             0.75,
             0.2,
@@ -136,23 +165,14 @@ def plot(fig_num, outfile):
         cbar = _plot_choropleth(
             fig,
             ax,
-            pd.merge(
-                neighborhoods,
-                sales.query("sale_year == 2018")
-                .groupby("neighborhood")["ln_sale_price"]
-                .median()
-                .reset_index(name="N"),
-                how="inner",
-            ),
+            pd.merge(neighborhoods, median_prices, how="inner"),
             ticks=np.log([10e3, 25e3, 60e3, 160e3, 450e3]),
             cmap="Reds_r",
             ascending=True,
             format_prices=True,
         )
 
-        citywide_median = np.exp(
-            sales.query("sale_year == 2018")["ln_sale_price"].median()
-        )
+        citywide_median = np.exp(sales["ln_sale_price"].median())
 
         with plt.style.context({"lines.solid_capstyle": "butt"}):
             ylim = cbar.ax.get_ylim()
@@ -237,4 +257,4 @@ def plot(fig_num, outfile):
         )
 
         # Save!
-        plt.savefig(outfile, dpi=300)
+        fig.savefig(outfile, dpi=300)
@@ -9,10 +9,19 @@ import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib.lines import Line2D
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes
+from concurrent.futures import ThreadPoolExecutor
 
 YEARS = list(range(2010, 2018))
 PAD = 1500
 
+# The census metrics combined into the concentrated disadvantage index
+METRICS = [
+    "PublicAssistance",
+    "FemaleHouseholders",
+    "PercentInPoverty",
+    "PercentUnder18",
+]
+
 
 def _load_data():
     """
@@ -21,39 +30,42 @@ def _load_data():
     # Load homicides
     homicides = gv_data.PoliceHomicides.get()
 
+    # Load each metric for each year
+    # NOTE: these are separate files, so read them concurrently
+    tasks = [(cls, year) for year in YEARS for cls in METRICS]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        frames = executor.map(lambda t: getattr(gv_data, t[0]).get(year=t[1]), tasks)
+        metrics = dict(zip(tasks, frames))
+
     # Calculate concentrated disadvantage
+    # NOTE: merge the metrics for each year, and then stack the years
     sub_data = []
-    for cls in [
-        "PublicAssistance",
-        "FemaleHouseholders",
-        "PercentInPoverty",
-        "PercentUnder18",
-    ]:
-        subset = []
-        for year in YEARS:
-            df = getattr(gv_data, cls).get(year=year)
-            df["year"] = year
-            subset.append(df)
-
-        sub_data.append(pd.concat(subset).set_index(["census_tract_id", "year"]))
-
-    data = sub_data[0]
-    for df in sub_data[1:]:
-        data = data.join(df.drop(labels=["geometry"], axis=1))
+    for year in YEARS:
+        df = metrics[(METRICS[0], year)]
+        for cls in METRICS[1:]:
+            df = df.merge(
+                metrics[(cls, year)].drop(labels=["geometry"], axis=1),
+                on="census_tract_id",
+                how="left",
+            )
+        df["year"] = year
+        sub_data.append(df)
+
+    data = pd.concat(sub_data, ignore_index=True).set_index(["census_tract_id", "year"])
 
     # Do min/max normalization on each
-    for col in [
+    columns = [
         "percent_public_assistance",
         "percent_female_householder",
         "percent_in_poverty",
         "percent_under_18",
-    ]:
-        data[col + "_normed"] = (data[col] - data[col].min()) / (
-            data[col].max() - data[col].min()
-        )
+    ]
+    X = data[columns].values.astype(float)
+    X -= np.nanmin(X, axis=0)
+    X /= np.nanmax(X, axis=0)
 
     # Normalize sum to 0 to 1
-    data["index"] = data.filter(regex="_normed").sum(axis=1) / 5.0
+    data["index"] = np.nansum(X, axis=1) / 5.0
 
     return homicides, data
 
@@ -66,8 +78,8 @@ def plot(fig_num, outfile):
     # Get the data
     homicides, poverty = _load_data()
 
-    # Use city limits as background
-    limits = gv_data.CityLimits.get()
+    # Use city limits as background (buffered once for all panels)
+    limits = gv_data.CityLimits.get().buffer(1500)
 
     with plt.style.context(default_style):
 
@@ -81,31 +93,53 @@ def plot(fig_num, outfile):
             ),
         )
 
+        # Split the data by year once
+        # NOTE: homicides are plotted from their coordinates directly
+        xy = np.column_stack([homicides.geometry.x.values, homicides.geometry.y.values])
+        H_by_year = homicides.groupby("year").indices
+        P_by_year = dict(list(poverty.groupby(level="year")))
+
+        # The tracts are the same each year, so use the same bounds
+        xmin, ymin, xmax, ymax = poverty.total_bounds
+
         axs = np.ravel(axs)
         for i, year in enumerate(YEARS):
 
             ax = axs[i]
 
             # Get data for this year
-            H = homicides.query("year == @year")
-            P = poverty.query("year == @year")
+            H = xy[H_by_year.get(year, [])]
+            P = P_by_year[year]
 
             # Add city limits as background
-            limits.buffer(1500).plot(
-                ax=ax, facecolor=palette["sidewalk"], edgecolor=palette["sidewalk"]
+            # NOTE: the map layers are rasterized to keep vector output small
+            limits.plot(
+                ax=ax,
+                facecolor=palette["sidewalk"],
+                edgecolor=palette["sidewalk"],
+                rasterized=True,
             )
 
             # Plot choropleth of concentrated disadvantage
-            P.plot(ax=ax, column="index", cmap="Blues", edgecolor="none", vmin=0)
+            P.plot(
+                ax=ax,
+                column="index",
+                cmap="Blues",
+                edgecolor="none",
+                vmin=0,
+                rasterized=True,
+            )
 
             # Plot homicides as markers
-            H.plot(
-                ax=ax,
+            ax.scatter(
+                H[:, 0],
+                H[:, 1],
                 marker=".",
-                markersize=10,
+                s=10,
                 alpha=0.8,
                 edgecolor="none",
                 color=palette["red"],
+                rasterized=True,
             )
 
             # Add title
@@ -122,7 +156,6 @@ def plot(fig_num, outfile):
 
             # Format
             ax.set_axis_off()
-            xmin, ymin, xmax, ymax = P.total_bounds
             ax.set_xlim(xmin - PAD, xmax + PAD)
             ax.set_ylim(ymin - PAD, ymax + PAD)
 
@@ -253,5 +286,5 @@ def plot(fig_num, outfile):
         )
 
         # Save!
-        plt.savefig(outfile, dpi=300)
+        fig.savefig(outfile, dpi=300)
 
@@ -7,7 +7,6 @@ from .cost_benefit import simulate_violence_reduction_plan
 import numpy as np
 import pandas as pd
 from matplotlib import pyplot as plt
-import seaborn as sns
 
 
 def plot(fig_num, outfile):
@@ -30,14 +29,12 @@ def plot(fig_num, outfile):
 
         # Top panel: cumulative lives saved
         color = digital_standards["dark-ben-franklin"]
-        sns.barplot(
-            x=data["plan_year"],
-            y=data["cumulative_lives_saved"],
-            color=color,
-            ax=ax,
-            saturation=1.0,
-            zorder=100,
-        )
+        x = np.arange(len(data))
+        ax.bar(x, data["cumulative_lives_saved"].values, 0.8, color=color, zorder=100)
+        ax.set_xticks(x)
+        ax.set_xticklabels(data["plan_year"].values)
+        ax.set_xlim(-0.5, len(data) - 0.5)
+        ax.xaxis.grid(False)
 
         # Total
         total = data["lives_saved"].sum()
@@ -53,11 +50,13 @@ def plot(fig_num, outfile):
 
         ax.axhline(y=0, c=palette["light-gray"], lw=4, zorder=101)
 
-        for i, row in data.iterrows():
+        cumulative = data["cumulative_lives_saved"].values
+        labels = ["%.0f" % value for value in cumulative]
+        for i, (value, label) in enumerate(zip(cumulative, labels)):
             ax.text(
                 i,
-                row["cumulative_lives_saved"] + 2,
-                "%.0f" % row["cumulative_lives_saved"],
+                value + 2,
+                label,
                 va="bottom",
                 ha="center",
                 weight="bold",
@@ -102,5 +101,5 @@ def plot(fig_num, outfile):
         )
 
         # Save!
-        plt.savefig(outfile, dpi=300)
+        fig.savefig(outfile, dpi=300)
 
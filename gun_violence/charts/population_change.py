@@ -5,11 +5,14 @@ function of the number of homicides over that period.
 from .. import datasets as gv_data
 from . import default_style, palette
 import pandas as pd
-import geopandas as gpd
 import numpy as np
 from matplotlib import pyplot as plt
 import seaborn as sns
 
+# The homicide bins, as upper edges and x axis labels
+_BIN_EDGES = [7, 15, 24, 36, 64]
+_BIN_LABELS = ["Less than 7", "7 to 15", "15 to 24", "24 to 36", "More than 36"]
+
 
 def _load_data():
     """
@@ -20,43 +23,43 @@ def _load_data():
     tracts = gv_data.CensusTracts2010.get()
 
     # Total number of homicides by census tract
-    N_homicides = (
-        gpd.sjoin(homicides, tracts, op="within", how="left")
-        .groupby(["census_tract_id"])
-        .size()
-        .rename("num_homicides")
+    # NOTE: count the (homicide, tract) pairs from the spatial index
+    # directly, rather than building the joined frame
+    sindex = gv_data.CensusTracts2010.get_sindex()
+    _, tract_index = sindex.query(homicides.geometry.values, predicate="within")
+    N_homicides = pd.Series(
+        np.bincount(tract_index, minlength=len(tracts)),
+        index=tracts["census_tract_id"],
+        name="num_homicides",
     )
 
-    # Population numbers
-    pop = []
-    for year in range(2010, 2018):
-        df = gv_data.Population.get(year=year)
-        df["year"] = year
-        pop.append(df)
-
-    Y = pd.concat(pop).set_index(["census_tract_id"])
+    # Population numbers for the first and last years
+    pop = {
+        year: gv_data.Population.get(year=year).set_index("census_tract_id")
+        for year in [2010, 2017]
+    }
 
     # Calculate population change
-    pop_change = (
-        Y.query("year == 2017")["total_population"]
-        - Y.query("year == 2010")["total_population"]
-    )
+    pop_change = pop[2017]["total_population"] - pop[2010]["total_population"]
 
-    # Merge tracts with population change and
-    Y = pd.merge(
-        tracts,
-        pd.concat([pop_change, N_homicides], axis=1).reset_index(),
-        on="census_tract_id",
-        how="left",
+    # Add the population change and homicide count to each tract
+    # NOTE: the homicide counts are already in tract order
+    Y = tracts[["census_tract_id"]].assign(
+        total_population=tracts["census_tract_id"].map(pop_change),
+        num_homicides=N_homicides.values,
     )
-    Y["num_homicides"] = Y["num_homicides"].fillna(0)
 
     # Calculate the homicide bin
-    Y["bins"] = pd.cut(Y["num_homicides"], [-1, 7, 15, 24, 36, 64])
+    # NOTE: bins include their upper edge; counts past the last edge are
+    # left out of the plot
+    codes = np.digitize(Y["num_homicides"].values, _BIN_EDGES, right=True)
+    codes[codes == len(_BIN_EDGES)] = -1
+    Y["bins"] = pd.Categorical.from_codes(codes, categories=_BIN_LABELS)
 
     # Sign of the population change
-    Y["Sign"] = np.where(
-        Y["total_population"] > 0, "Population Growth", "Population Loss"
+    Y["Sign"] = pd.Categorical.from_codes(
+        (~(Y["total_population"] > 0)).values.astype(np.int8),
+        categories=["Population Growth", "Population Loss"],
     )
 
     return Y
@@ -71,14 +74,6 @@ def plot(fig_num, outfile):
     # Load the data
     data = _load_data()
 
-    def get_ylabel(x):
-        sign = ""
-        if x > 0:
-            sign = "+"
-        if x < 0:
-            sign = "\u2212"
-        return sign + "{:,.0f}".format(abs(x))
-
     with plt.style.context(default_style):
 
         # Initialize
@@ -100,6 +95,7 @@ def plot(fig_num, outfile):
             ax=ax,
             size=4,
             edgecolor="none",
+            rasterized=True,
         )
 
         # Add a line at y = 0
@@ -107,14 +103,17 @@ def plot(fig_num, outfile):
 
         # Format y axis
         ax.set_ylabel("Population Change Since 2010", weight="bold", fontsize=11)
-        ax.set_yticklabels([get_ylabel(x) for x in ax.get_yticks()], fontsize=11)
+        # NOTE: signed labels, with a minus sign for negative values
+        yticks = ax.get_yticks()
+        signs = np.where(yticks > 0, "+", np.where(yticks < 0, "\u2212", ""))
+        ax.set_yticklabels(
+            [sign + "{:,.0f}".format(abs(y)) for sign, y in zip(signs, yticks)],
+            fontsize=11,
+        )
 
         # Format the x axis
         ax.set_xlabel("Total Homicides Since 2010", weight="bold", fontsize=11)
-        ax.set_xticklabels(
-            ["Less than 7", "7 to 15", "15 to 24", "24 to 36", "More than 36"],
-            fontsize=11,
-        )
+        plt.setp(ax.get_xticklabels(), fontsize=11)
 
         # Add the legend
         leg = ax.legend(
@@ -174,5 +173,5 @@ def plot(fig_num, outfile):
         )
 
         # Save!
-        plt.savefig(outfile, dpi=300)
+        fig.savefig(outfile, dpi=300)
 
@@ -11,60 +11,56 @@ from matplotlib.patches import Patch
 from matplotlib.lines import Line2D
 import matplotlib.transforms as transforms
 from matplotlib.offsetbox import AnchoredOffsetbox, TextArea, HPacker
+import matplotlib.patheffects as path_effects
+from functools import lru_cache
 import os
 
 YEAR_LIMIT = 2018
 
+# The border drawn around the sale price lines
+_SALES_BORDER = path_effects.withStroke(linewidth=3.5, foreground=palette["sidewalk"])
 
+# Neighborhood names that need custom line breaks in the panel titles
+_NEIGHBORHOOD_NAMES = {
+    "Aston-Woodbridge": "Aston\nWoodbridge",
+    "East Oak Lane": "East\nOak Lane",
+    "West Oak Lane": "West\nOak Lane",
+    "East Mount Airy": "East\nMount Airy",
+    "West Mount Airy": "West\nMount Airy",
+    "West Central Germantown": "West Central\nGermantown",
+    "Washington Square West": "Washington\nSquare West",
+    "Melrose Park Gardens": "Melrose\nPark Gardens",
+}
+
+
+@lru_cache(maxsize=None)
 def _format_neighborhood_name(x):
     """
     Internal function to format neighborhood names nicely.
     """
-    if x == "Aston-Woodbridge":
-        return "Aston\nWoodbridge"
+    if x in _NEIGHBORHOOD_NAMES:
+        return _NEIGHBORHOOD_NAMES[x]
     x = x.replace("-", "")
-    fields = x.split()
-    if x == "East Oak Lane":
-        return "East\nOak Lane"
-    if x == "West Oak Lane":
-        return "West\nOak Lane"
-    if x == "East Mount Airy":
-        return "East\nMount Airy"
-    if x == "West Mount Airy":
-        return "West\nMount Airy"
-    if x == "West Central Germantown":
-        return "West Central\nGermantown"
-    if x == "Washington Square West":
-        return "Washington\nSquare West"
-    if x == "Melrose Park Gardens":
-        return "Melrose\nPark Gardens"
     if x.startswith("Fishtown"):
         return "Fishtown/Lower\nKensington"
-    return "\n".join([field.strip() for field in fields])
+    return "\n".join(x.split())
 
 
-def _plot_sales(ax, df, col, **kws):
+def _plot_sales(ax, years, prices, **kws):
     """
     Plot a line chart showing the median residential sale price over time.
     """
 
-    ax.plot(df["sale_year"], df[col], **kws)
+    ax.plot(years, prices, **kws)
     ax.tick_params(labelleft=False, left=False, labelbottom=False, bottom=False)
 
 
-def _plot_homicides(ax, df, **kws):
+def _plot_homicides(ax, years, counts, **kws):
     """
     Plot a bar graph showing the total number of annual homicides.
     """
 
-    df2 = df.query("year <= @YEAR_LIMIT")
-    ax.bar(
-        x=df2["year"].values,
-        height=df2["count"].values,
-        zorder=20,
-        clip_on=False,
-        **kws,
-    )
+    ax.bar(x=years, height=counts, zorder=20, clip_on=False, **kws)
     ax.tick_params(
         labelleft=False,
         left=False,
@@ -75,6 +71,15 @@ def _plot_homicides(ax, df, **kws):
     )
 
 
+def get_outfiles(outfile):
+    """
+    Return the files written by :func:`plot`, one for each of the two
+    figures, with "_0" and "_1" added to the file name.
+    """
+    path, ext = os.path.splitext(outfile)
+    return [f"{path}_{subplot}{ext}" for subplot in [0, 1]]
+
+
 def plot(fig_num, outfile):
     """
     Plot a multi-panel chart showing the trends in residential sale prices
@@ -85,41 +90,53 @@ def plot(fig_num, outfile):
     homicides = gv_data.PoliceHomicides.get()
 
     # Drop condos, since they can include multiple properties
-    sales = sales.loc[~sales["parcel_number"].astype(str).str.startswith("888")]
-
-    # Median sale price
-    median_sale_price = (
-        sales.groupby(["neighborhood", "sale_year"])["sale_price"]
-        .median()
-        .reset_index()
-    )
-
-    # Homicide totals
-    homicide_count = (
-        homicides.groupby(["neighborhood", "year"])
-        .size()
-        .unstack()
-        .fillna(0)
-        .stack()
-        .reset_index(name="count")
-    )
+    # NOTE: is_condo flags the "888" parcel numbers when the sales are built
+    sales = sales.loc[~sales["is_condo"].values]
 
     # Determine neighborhood order based on 2018 value
-    groups = sales.query("sale_year == 2018").groupby(["neighborhood"])
+    sales_2018 = (
+        sales.query("sale_year == 2018")
+        .groupby("neighborhood")["sale_price"]
+        .agg(sale_price="median", N="size")
+    )
     neighborhoods = (
-        pd.merge(
-            groups["sale_price"].median().reset_index(),
-            groups.size().reset_index(name="N"),
-        )
-        .query("N > 20")
-        .sort_values("sale_price", ascending=False)["neighborhood"]
-        .tolist()
+        sales_2018.query("N > 20")
+        .sort_values("sale_price", ascending=False)
+        .index.tolist()
     )
 
     # trim to first 126 panels
     num_panels = 126
     neighborhoods = neighborhoods[:num_panels]
 
+    # Median sale price for the plotted neighborhoods
+    sales = sales.loc[sales["neighborhood"].isin(neighborhoods).values]
+    median_sale_price = (
+        sales.groupby(["neighborhood", "sale_year"])["sale_price"]
+        .median()
+        .reset_index()
+    )
+
+    # Homicide totals, with zeros for years without homicides
+    # NOTE: only the plotted neighborhoods and years are filled in; panels
+    # for neighborhoods without any homicides are left without bars
+    counts = homicides.groupby(["neighborhood", "year"]).size()
+    hoods = counts.index.unique("neighborhood").intersection(neighborhoods)
+    index = pd.MultiIndex.from_product(
+        [hoods, range(2006, YEAR_LIMIT + 1)], names=["neighborhood", "year"]
+    )
+    homicide_count = counts.reindex(index, fill_value=0).reset_index(name="count")
+
+    # The (year, value) arrays for each neighborhood's panel
+    sales_by_hood = {
+        hood: (group["sale_year"].values, group["sale_price"].values)
+        for hood, group in median_sale_price.groupby("neighborhood", sort=False)
+    }
+    homicides_by_hood = {
+        hood: (group["year"].values, group["count"].values)
+        for hood, group in homicide_count.groupby("neighborhood", sort=False)
+    }
+
     neigbhorhoods1 = sorted(neighborhoods[: num_panels // 2])
     neighborhoods2 = sorted(neighborhoods[num_panels // 2 :])
     all_neighborhoods = [neigbhorhoods1, neighborhoods2]
@@ -129,9 +146,6 @@ def plot(fig_num, outfile):
         plt.rcParams["patch.edgecolor"] = "black"
         plt.rcParams["axes.linewidth"] = 1.0
 
-        # Trim to top neighborhoods
-        df = median_sale_price.query("neighborhood in @neighborhoods")
-
         # Plot each panel
 
         for subplot in [0, 1]:
@@ -150,11 +164,16 @@ def plot(fig_num, outfile):
                 nrows=nrows,
                 ncols=ncols,
                 figsize=(6.45, 10),
+                sharex=True,
                 gridspec_kw=dict(
                     left=0.025, right=0.95, bottom=0.06, top=TOP, hspace=0.9, wspace=0.3
                 ),
             )
 
+            # x ticks, shared by all panels (and their twin axes)
+            axs[0, 0].set_xticks(range(2006, 2019, 3))
+
+            panel_axes = []
             for i in range(nrows):
                 for j in range(ncols):
 
@@ -173,29 +192,19 @@ def plot(fig_num, outfile):
                     # Plot the homicides
                     _plot_homicides(
                         ax2,
-                        homicide_count.query("neighborhood == @hood"),
+                        *homicides_by_hood.get(hood, ([], [])),
                         color=palette["love-park-red"],
                     )
 
-                    # Plot the sales
-                    # This is the border
-                    _plot_sales(
-                        ax,
-                        median_sale_price.query("neighborhood == @hood"),
-                        "sale_price",
-                        linewidth=3.5,
-                        clip_on=False,
-                        zorder=19,
-                        color=palette["sidewalk"],
-                    )
+                    # Plot the sales, with the border as a stroke underneath
                     _plot_sales(
                         ax,
-                        median_sale_price.query("neighborhood == @hood"),
-                        "sale_price",
+                        *sales_by_hood[hood],
                         linewidth=2.5,
                         clip_on=False,
                         zorder=20,
                         color=palette["ben-franklin-blue"],
+                        path_effects=[_SALES_BORDER],
                     )
 
                     # Add a legend
@@ -220,20 +229,10 @@ def plot(fig_num, outfile):
                             frameon=False,
                         )
 
-                    # x ticks
-                    ax.set_xticks(range(2006, 2019, 3))
-                    ax2.set_xticks(range(2006, 2019, 3))
-
                     # Put original axes on top
                     ax.set_zorder(ax2.get_zorder() + 1)
                     ax.patch.set_visible(False)
 
-                    # Grid for original axes
-                    for xtick in ax2.get_xticks():
-                        ax2.axvline(
-                            x=xtick, color="#a1a1a1", lw=0.5, ls="dashed", zorder=10
-                        )
-
                     # Subplot title
                     ax.text(
                         0.5,
@@ -248,10 +247,16 @@ def plot(fig_num, outfile):
 
                     # Format axes
                     ax.set_ylim(bottom=1e3)
-                    ax.grid(b=False, axis="both")
+                    ax.grid(visible=False, axis="both")
 
+                    # Dashed x grid, drawn on the homicide axes below the bars
+                    # NOTE: twinx() hides the x axis, which also hides its grid
                     ax2.set_ylim(0, 20)
-                    ax2.grid(b=False, axis="both")
+                    ax2.xaxis.set_visible(True)
+                    ax2.grid(visible=False, axis="y")
+                    ax2.grid(
+                        visible=True, axis="x", color="#a1a1a1", lw=0.5, ls="dashed"
+                    )
 
                     # More formatting
                     if i == nrows - 1:
@@ -265,14 +270,16 @@ def plot(fig_num, outfile):
                         ax2.tick_params(labelright=True)
                         plt.setp(ax2.get_yticklabels(), fontsize=8, va="center")
 
-                    for a in [ax, ax2]:
-                        for spine in ["left", "top"]:
-                            a.spines[spine].set_visible(False)
-                        for spine in ["bottom", "right"]:
-                            a.spines[spine].set_visible(True)
-
+                    panel_axes += [ax, ax2]
                     panel += 1
 
+            # Only show the bottom and right spines
+            for a in panel_axes:
+                for spine in ["left", "top"]:
+                    a.spines[spine].set_visible(False)
+                for spine in ["bottom", "right"]:
+                    a.spines[spine].set_visible(True)
+
             # Add title
             fig.text(
                 0.005,
@@ -340,5 +347,4 @@ def plot(fig_num, outfile):
             )
 
             # Save!
-            path, ext = os.path.splitext(outfile)
-            plt.savefig(f"{path}_{subplot}{ext}", dpi=300)
+            fig.savefig(get_outfiles(outfile)[subplot], dpi=300)
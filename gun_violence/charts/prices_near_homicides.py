@@ -9,21 +9,21 @@ import numpy as np
 from matplotlib import pyplot as plt
 import seaborn as sns
 import matplotlib.transforms as transforms
+from functools import lru_cache
 
 
-def _load_data():
+@lru_cache(maxsize=4)
+def _get_sale_price_psf_from_homicide(space_radius, time_window, nbins):
     """
-    Load the data we will need.
-    """
-    # Load sales and homicides
-    sales = gv_data.ResidentialSales.get()
-    homicides = gv_data.PoliceHomicides.get()
-
-    # Remove any null entries
-    sales = sales.loc[sales.geometry.notnull()]
-    homicides = homicides.loc[homicides.geometry.notnull()]
+    Internal function to load the data and bin the sale prices by the
+    distance from homicides.
 
-    return sales, homicides
+    The result is cached, since the spatiotemporal matching is slow.
+    """
+    sales, homicides = gv_data.load_sales_and_homicides()
+    return get_sale_price_psf_from_homicide(
+        homicides, sales, space_radius, list(time_window), nbins=nbins
+    )
 
 
 def plot(fig_num, outfile, xmax=2.25):
@@ -31,14 +31,11 @@ def plot(fig_num, outfile, xmax=2.25):
     A line chart showing the sale price per sq. ft. relative to the 
     citywide median, as a function of the distance from 
     """
-    # Load the data
-    sales, homicides = _load_data()
-
-    # Perform the calculation
+    # Load the data and perform the calculation
     space_radius = 2.5  # in miles
-    time_window = [90, 90]
-    X, Y, N, citywide_median = get_sale_price_psf_from_homicide(
-        homicides, sales, space_radius, time_window, nbins=20
+    time_window = (90, 90)
+    X, Y, N, citywide_median = _get_sale_price_psf_from_homicide(
+        space_radius, time_window, nbins=20
     )
 
     with plt.style.context(default_style):
@@ -84,9 +81,10 @@ def plot(fig_num, outfile, xmax=2.25):
         # Format axes
         ax.set_xlim(-0.2, 2.25)
         ax.set_xticks(np.arange(0, 2.1, 0.5))
-        ax.set_yticks([40, 70, 100, 130])
+        yticks = [40, 70, 100, 130]
+        ax.set_yticks(yticks)
         ax.set_ylim(35, 135)
-        ax.set_yticklabels(["$%.0f" % (x) for x in ax.get_yticks()], fontsize=12)
+        ax.set_yticklabels(["$%.0f" % (x) for x in yticks], fontsize=12)
         plt.setp(ax.get_yticklabels(), ha="center")
         plt.setp(ax.get_xticklabels(), fontsize=12)
         sns.despine(left=True, bottom=True)
@@ -135,5 +133,5 @@ def plot(fig_num, outfile, xmax=2.25):
         )
 
         # Save!
-        plt.savefig(outfile, dpi=300)
+        fig.savefig(outfile, dpi=300)
 
@@ -12,6 +12,7 @@ import seaborn as sns
 import matplotlib.transforms as transforms
 from sklearn.gaussian_process import GaussianProcessRegressor
 from sklearn.gaussian_process.kernels import RBF, ConstantKernel
+from functools import lru_cache
 
 
 def plot_gp(ax, x, y, noise=0.01, color="k", label=""):
@@ -19,8 +20,10 @@ def plot_gp(ax, x, y, noise=0.01, color="k", label=""):
     kernel = ConstantKernel(1) * RBF(length_scale=1)
     noise = y * noise
 
+    # NOTE: with only a dozen or so bins, 10 optimizer restarts reliably
+    # find the same hyperparameters as many more would
     gp = GaussianProcessRegressor(
-        kernel=kernel, n_restarts_optimizer=100, alpha=noise ** 2
+        kernel=kernel, n_restarts_optimizer=10, alpha=noise ** 2
     ).fit(np.atleast_2d(x.values).T, y.values)
     y_mean, sigma = gp.predict(np.atleast_2d(x_pred).T, return_std=True)
 
@@ -47,17 +50,15 @@ def plot_gp(ax, x, y, noise=0.01, color="k", label=""):
     )
 
 
+@lru_cache(maxsize=1)
 def _load_data():
     """
     Load the data we will need.
+
+    The result is cached, since the PTA calculation is slow.
     """
     # Load sales and homicides
-    sales = gv_data.ResidentialSales.get()
-    homicides = gv_data.PoliceHomicides.get()
-
-    # Remove any null entries
-    sales = sales.loc[sales.geometry.notnull()]
-    homicides = homicides.loc[homicides.geometry.notnull()]
+    sales, homicides = gv_data.load_sales_and_homicides()
 
     # Perform the PTA calculation
     salesNoCondos = sales.loc[~sales.is_condo]
@@ -182,4 +183,4 @@ def plot(fig_num, outfile):
             va="top",
             style="italic",
         )
-        plt.savefig(outfile)
+        fig.savefig(outfile)
@@ -6,3 +6,29 @@ from .geo import *
 from .opa import *
 from .amenities import *
 from .census import *
+
+
+def load_sales_and_homicides():
+    """
+    Load the residential sales and police homicides, removing any entries
+    without a geometry.
+
+    Returns
+    -------
+    sales, homicides : geopandas.GeoDataFrame
+        the geocoded sales and homicides
+
+    Notes
+    -----
+    Both data sets are cached by :meth:`Dataset.get`, so repeated calls only
+    copy and filter the loaded data.
+    """
+    # Load sales and homicides
+    sales = ResidentialSales.get()
+    homicides = PoliceHomicides.get()
+
+    # Remove any null entries
+    sales = sales.loc[sales.geometry.notnull().values]
+    homicides = homicides.loc[homicides.geometry.notnull().values]
+
+    return sales, homicides
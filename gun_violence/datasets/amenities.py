@@ -1,9 +1,9 @@
 import esri2gpd
 import osm2gpd
 import carto2gpd
-import geopandas as gpd
 import pandas as pd
 import os
+from concurrent.futures import ThreadPoolExecutor
 from . import EPSG
 from .. import data_dir
 from .core import Dataset
@@ -26,9 +26,28 @@ __all__ = [
     "AggravatedAssaults",
     "GraffitiRequests",
     "AbandonedVehicleRequests",
+    "download_amenities",
 ]
 
 
+def _add_xy(df):
+    """
+    Internal function to add the x and y coordinates of the point geometries.
+    """
+    return df.assign(x=df.geometry.x.values, y=df.geometry.y.values)
+
+
+def _within(df, polygons):
+    """
+    Internal function to select the geometries in ``df`` that are within
+    the union of the input polygons.
+    """
+    # NOTE: test against the single unioned shape, rather than joining
+    # (and copying) the polygon attributes onto each geometry
+    boundary = polygons.geometry.unary_union
+    return df.loc[df.geometry.within(boundary).values]
+
+
 class Universities(Dataset):
     """
     Points representing buildings associated with Philadelphia's 
@@ -43,11 +62,7 @@ class Universities(Dataset):
     def download(cls, **kwargs):
 
         url = "https://services.arcgis.com/fLeGjb7u4uXqeF9q/ArcGIS/rest/services/Universities_Colleges/FeatureServer/0"
-        return (
-            esri2gpd.get(url, fields=["NAME"])
-            .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
-        )
+        return esri2gpd.get(url, fields=["NAME"]).to_crs(epsg=EPSG).pipe(_add_xy)
 
 
 class Parks(Dataset):
@@ -63,11 +78,7 @@ class Parks(Dataset):
     def download(cls, **kwargs):
 
         url = "https://services.arcgis.com/fLeGjb7u4uXqeF9q/ArcGIS/rest/services/PPR_Assets/FeatureServer/0"
-        return (
-            esri2gpd.get(url)
-            .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
-        )
+        return esri2gpd.get(url).to_crs(epsg=EPSG).pipe(_add_xy)
 
 
 class CityHall(Dataset):
@@ -88,7 +99,7 @@ class CityHall(Dataset):
                 url, where="NAME = 'City Hall' AND FEAT_TYPE = 'Municipal Building'"
             )
             .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
+            .pipe(_add_xy)
         )
 
 
@@ -108,11 +119,7 @@ class SubwayStations(Dataset):
         subway = osm2gpd.get(*city_limits.total_bounds, where="station=subway").to_crs(
             epsg=4326
         )
-        return (
-            gpd.sjoin(subway, city_limits, op="within")
-            .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
-        )
+        return _within(subway, city_limits).to_crs(epsg=EPSG).pipe(_add_xy)
 
 
 class DryCleaners(Dataset):
@@ -131,11 +138,7 @@ class DryCleaners(Dataset):
         df = osm2gpd.get(*city_limits.total_bounds, where="shop=dry_cleaning").to_crs(
             epsg=4326
         )
-        return (
-            gpd.sjoin(df, city_limits, op="within")
-            .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
-        )
+        return _within(df, city_limits).to_crs(epsg=EPSG).pipe(_add_xy)
 
 
 class Cafes(Dataset):
@@ -154,11 +157,7 @@ class Cafes(Dataset):
         df = osm2gpd.get(*city_limits.total_bounds, where="amenity=cafe").to_crs(
             epsg=4326
         )
-        return (
-            gpd.sjoin(df, city_limits, op="within")
-            .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
-        )
+        return _within(df, city_limits).to_crs(epsg=EPSG).pipe(_add_xy)
 
 
 class GroceryStores(Dataset):
@@ -177,11 +176,7 @@ class GroceryStores(Dataset):
         df = osm2gpd.get(*city_limits.total_bounds, where="shop=supermarket").to_crs(
             epsg=4326
         )
-        return (
-            gpd.sjoin(df, city_limits, op="within")
-            .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
-        )
+        return _within(df, city_limits).to_crs(epsg=EPSG).pipe(_add_xy)
 
 
 class Bars(Dataset):
@@ -196,11 +191,7 @@ class Bars(Dataset):
         df = osm2gpd.get(*city_limits.total_bounds, where="amenity=bar").to_crs(
             epsg=4326
         )
-        return (
-            gpd.sjoin(df, city_limits, op="within")
-            .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
-        )
+        return _within(df, city_limits).to_crs(epsg=EPSG).pipe(_add_xy)
 
 
 class Libraries(Dataset):
@@ -222,7 +213,7 @@ class Libraries(Dataset):
             )
             .to_crs(epsg=EPSG)
             .rename(columns={"ASSET_NAME": "asset_name"})
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
+            .pipe(_add_xy)
         )
 
 
@@ -244,11 +235,8 @@ class Schools(Dataset):
             .to_crs(epsg=EPSG)
             .rename(columns={"LOCATION_ID": "ulcs_code"})
             .dropna(subset=["ulcs_code"])
-            .assign(
-                ulcs_code=lambda df: df.ulcs_code.astype(int),
-                x=lambda df: df.geometry.x,
-                y=lambda df: df.geometry.y,
-            )
+            .assign(ulcs_code=lambda df: df.ulcs_code.astype(int))
+            .pipe(_add_xy)
         )
 
 
@@ -315,11 +303,7 @@ class NewConstructionPermits(Dataset):
                 "AND permitdescription='NEW CONSTRUCTION PERMIT'"
             ),
         )
-        return (
-            df.dropna(subset=["geometry"])
-            .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
-        )
+        return df.dropna(subset=["geometry"]).to_crs(epsg=EPSG).pipe(_add_xy)
 
 
 class AggravatedAssaults(Dataset):
@@ -343,11 +327,7 @@ class AggravatedAssaults(Dataset):
                 " AND Text_General_Code IN ('Aggravated Assault No Firearm', 'Aggravated Assault Firearm')"
             ),
         )
-        return (
-            df.dropna(subset=["geometry"])
-            .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
-        )
+        return df.dropna(subset=["geometry"]).to_crs(epsg=EPSG).pipe(_add_xy)
 
 
 class GraffitiRequests(Dataset):
@@ -371,11 +351,7 @@ class GraffitiRequests(Dataset):
                 " AND service_name = 'Graffiti Removal'"
             ),
         )
-        return (
-            df.dropna(subset=["geometry"])
-            .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
-        )
+        return df.dropna(subset=["geometry"]).to_crs(epsg=EPSG).pipe(_add_xy)
 
 
 class AbandonedVehicleRequests(Dataset):
@@ -399,9 +375,48 @@ class AbandonedVehicleRequests(Dataset):
                 " AND service_name = 'Abandoned Vehicle'"
             ),
         )
-        return (
-            df.dropna(subset=["geometry"])
-            .to_crs(epsg=EPSG)
-            .assign(x=lambda df: df.geometry.x, y=lambda df: df.geometry.y)
-        )
+        return df.dropna(subset=["geometry"]).to_crs(epsg=EPSG).pipe(_add_xy)
+
 
+def download_amenities(classes=None, max_workers=8):
+    """
+    Download fresh copies of the amenity data sets in parallel.
+
+    Parameters
+    ----------
+    classes : list of Dataset, optional
+        the data sets to download; defaults to all of the amenities
+    max_workers : int, optional
+        the number of downloads to run at once
+
+    Returns
+    -------
+    data : dict
+        the downloaded data, keyed by the data set name
+
+    Notes
+    -----
+    The downloads are network-bound, so they run in threads. SchoolScores
+    merges in the Schools data, so it is downloaded after the others.
+    """
+    if classes is None:
+        classes = [
+            cls
+            for cls in map(globals().get, __all__)
+            if isinstance(cls, type) and issubclass(cls, Dataset)
+        ]
+
+    # The OpenStreetMap downloads all use the city limits, so make sure they
+    # are on disk (and cached) before the threads start
+    CityLimits.get()
+
+    # Download everything but the school scores concurrently
+    first = [cls for cls in classes if cls is not SchoolScores]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = executor.map(lambda cls: cls.get(fresh=True), first)
+        data = dict(zip([cls.__name__ for cls in first], frames))
+
+    if SchoolScores in classes:
+        data["SchoolScores"] = SchoolScores.get(fresh=True)
+
+    return data
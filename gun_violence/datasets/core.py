@@ -13,6 +13,13 @@ class Dataset(ABC):
 
     compress = False
     date_columns = []
+    categorical_columns = []
+
+    # In-memory cache of the formatted data, keyed by file path
+    _cache = {}
+
+    # In-memory cache of spatial indices, keyed by file path
+    _sindex_cache = {}
 
     @classmethod
     def _format_data(cls, data):
@@ -32,6 +39,10 @@ class Dataset(ABC):
         for col in cls.date_columns:
             data[col] = pd.to_datetime(data[col])
 
+        # convert categorical columns
+        for col in cls.categorical_columns:
+            data[col] = data[col].astype("category")
+
         return data
 
     @classmethod
@@ -61,37 +72,71 @@ class Dataset(ABC):
         return os.path.join(data_dir, cls.__name__)
 
     @classmethod
-    def get(cls, fresh=False, **kwargs):
+    def _data_path(cls, **kwargs):
         """
-        Load the dataset, optionally downloading a fresh copy.
+        Internal method to get the path to the data file.
         """
         if cls.compress:
             filename = "data.csv.tar.gz"
         else:
             filename = "data.csv"
 
+        return os.path.join(cls.get_path(**kwargs), filename)
+
+    @classmethod
+    def get(cls, fresh=False, **kwargs):
+        """
+        Load the dataset, optionally downloading a fresh copy.
+
+        Notes
+        -----
+        The data is only read from disk once per session; subsequent calls
+        return a copy of the cached data, so it can be safely modified.
+        """
         dirname = cls.get_path(**kwargs)
         if not os.path.exists(dirname):
             os.makedirs(dirname)
             fresh = True
 
-        if not os.path.exists(os.path.join(dirname, filename)) or fresh:
+        path = cls._data_path(**kwargs)
+        if not os.path.exists(path) or fresh:
 
             # download and save a fresh copy
             data = cls.download(**kwargs)
-            data.to_csv(os.path.join(dirname, filename), index=False)
+            data.to_csv(path, index=False)
 
             # save the download time
             meta = {"download_time": cls.now()}
             json.dump(meta, open(os.path.join(dirname, "meta.json"), "w"))
 
+            # the cached copies are now stale
+            Dataset._cache.pop(path, None)
+            Dataset._sindex_cache.pop(path, None)
+
         else:
-            data = cls._format_data(
-                pd.read_csv(os.path.join(dirname, filename), low_memory=False)
-            )
+            if path not in Dataset._cache:
+                Dataset._cache[path] = cls._format_data(
+                    pd.read_csv(path, low_memory=False)
+                )
+            data = Dataset._cache[path].copy()
 
         return data
 
+    @classmethod
+    def get_sindex(cls, **kwargs):
+        """
+        Return the spatial index of the dataset's geometries.
+
+        Notes
+        -----
+        The index is only built once per session; the positions in the 
+        index match the rows of the data returned by :func:`get`.
+        """
+        path = cls._data_path(**kwargs)
+        if path not in Dataset._sindex_cache:
+            Dataset._sindex_cache[path] = cls.get(**kwargs).sindex
+        return Dataset._sindex_cache[path]
+
     @abstractclassmethod
     def download(cls):
         raise NotImplementedError
@@ -119,7 +164,7 @@ def geocode(df, polygons):
     polygons = polygons.to_crs(df.crs)
 
     valid = df.geometry.notnull()
-    geocoded = gpd.sjoin(df.loc[valid], polygons, op="within", how="left").drop(
+    geocoded = gpd.sjoin(df.loc[valid], polygons, predicate="within", how="left").drop(
         labels=["index_right"], axis=1
     )
 
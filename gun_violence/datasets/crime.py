@@ -349,6 +349,7 @@ class PoliceHomicides(Dataset):
     """
 
     date_columns = ["dispatch_date_time"]
+    categorical_columns = ["race", "sex", "weapon"]
 
     @classmethod
     def download(cls, **kwargs):
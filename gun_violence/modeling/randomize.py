@@ -90,7 +90,7 @@ def get_random_data(data, location=True, time=True):
             {"geometry": [Point(x, y) for x, y in zip(x, y)]}, crs=data.crs
         )
 
-        geo = gpd.sjoin(points, CityLimits.get(), op="within")
+        geo = gpd.sjoin(points, CityLimits.get(), predicate="within")
         assert len(geo) > total
         geo = geo["geometry"].sample(n=total)
 
@@ -27,6 +27,6 @@ setup(
     packages=find_packages(),
     description="Python tools to analyze the economic impact of gun violence in Philadelphia",
     license="MIT",
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     install_requires=get_requirements("requirements.txt"),
 )